@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from interpret import Instruction, Interpret, TemporaryFrame, FlowControl
+
+# debug printers of the interpreter, imported by interpret.py only when they are needed
+
+# the stream is looked up when printing, so a redirected sys.stdout or sys.stderr is respected
+def _stream(out: str):
+    return sys.stdout if out == "cout" else sys.stderr
+
+def named_variables(frame: list, slots: dict) -> dict:
+    '''
+    Turns a frame back into a dictionary of its defined variables by name, used for debug output.
+    :param frame: The frame, a list indexed by variable slots.
+    :type frame: list
+    :param slots: Maps the variable names to their slots in the frame.
+    :type slots: dict
+    '''
+    return {name: frame[slot] for name, slot in slots.items() if frame[slot] is not None}
+
+def print_stack(stack: list, out="cout") -> None:
+    '''
+    Prints out a stack (a plain list, the top of the stack is the last element).
+    :param stack: The stack to print.
+    :type stack: list
+    :param out: Either "cout" for stdout or anything else for stderr.
+    :type out: str
+    '''
+    # the whole stack is written at once
+    parts = ["["]
+
+    last = len(stack)-1
+    for i, item in enumerate(stack):
+        if i == 0:
+            parts.append("first element -> ")
+        parts.append(f"{item} ")
+        if i == last:
+            parts.append("<- last element")
+        else:
+            parts.append(",  ")
+
+    parts.append("] \n")
+    _stream(out).write("".join(parts))
+
+def print_frame(frame: TemporaryFrame, slots: dict, out="cout") -> None:
+    '''
+    Prints out the temporary frame and whether it is initialized.
+    :param frame: The temporary frame to print.
+    :type frame: TemporaryFrame
+    :param slots: Maps the variable names to their slots in the frame.
+    :type slots: dict
+    :param out: Either "cout" for stdout or anything else for stderr.
+    :type out: str
+    '''
+    fd = _stream(out)
+    print(named_variables(frame.data, slots), end="", file=fd)
+    if frame.exists():
+        print(" <- initialized", file=fd)
+    else:
+        print(" <- uninitialized", file=fd)
+
+def print_instruction_info(instruction: Instruction) -> None:
+    print(f"opcode: {instruction.opcode}")
+    print("Dependencies: ", end="")
+    for dependency in instruction.dependencies:
+        print(dependency, end=", ")
+    print()
+    print("instruction list: ", end="")
+    for literal in instruction.arg_list:
+        print(literal, end=", ")
+    print("\n")
+
+def print_instructions(flow: FlowControl) -> None:
+    for i, instruction in enumerate(flow.get_instructions()):
+        print(f"[{i}]", end=" ")
+        print(instruction[0], end=" ")
+        print(instruction[1].opcode)
+
+def print_everything(interpret: Interpret) -> None:
+    print(f"Input file: {interpret.ifile}")
+
+    print("Data stack: ", end="")
+    print_stack(interpret.data_stack)
+
+    print("Frame stack: ", end="")
+    print_stack([named_variables(frame, interpret.flow.local_slots) for frame in interpret.local_frame_stack])
+
+    print("global frame: ", end="")
+    print(named_variables(interpret.global_frame, interpret.flow.global_slots))
+
+    print("Temporary frame: ", end="")
+    print_frame(interpret.temporary_frame, interpret.flow.local_slots)
+
+    print(f"Label list: {interpret.label_list}")
+
+    print("Call stack: ", end="")
+    print_stack(interpret.call_stack)
@@ -1,11 +1,19 @@
-import getopt
+from __future__ import annotations
+
+import functools
+import io
+import operator
+import re
 import sys
-import xml.etree.ElementTree as et
-from collections import OrderedDict
-from typing import NoReturn, Any
+from array import array
+from typing import NoReturn, Any, Callable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import xml.etree.ElementTree as et
 
 VERSION = 0.3
 
+# error code -> message, built once at import and only read afterwards
 errlist = {
     10: "missing script parameter or use of a prohibited parameter combination",
     11: "error opening input files",
@@ -22,11 +30,40 @@ errlist = {
     99: "internal error"
 }
 
+# argument kind used in Operations.dispatch_table -> argument types it accepts
+_ARG_KINDS = {
+    "v": frozenset(("var",)),
+    "s": frozenset(("var", "int", "bool", "string", "nil")),
+    "l": frozenset(("label",)),
+    "t": frozenset(("type",))
+}
+
+# the full error lines, formatted once at import
+_ERR_MSGS = {code: f"Error code {code}: {msg}\n" for code, msg in errlist.items()}
+
+# escape sequence of a string constant, a backslash followed by a three digit decimal code
+_ESC_RE = re.compile(r"\\(\d{3})")
+
+# replacement for a matched escape sequence, defined once instead of a lambda per decoded string
+def _decode_escape(match: re.Match) -> str:
+    return chr(int(match.group(1)))
+
+# ids of the frames, variables are resolved to them at load time and they index Operations.frames
+GF, LF, TF = 0, 1, 2
+_FRAME_IDS = {"GF": GF, "LF": LF, "TF": TF}
+
+# text of a bool constant -> the python bool it is stored as
+_TO_BOOL = {"true": True, "false": False}
+
+# tag of an instruction argument -> its position in Instruction.arg_list
+_ARG_POSITIONS = {"arg1": 0, "arg2": 1, "arg3": 2}
+
 usage_dialog = """
 Usage:
     python interpret.py --source=file
     python interpret.py --input=file
     python interpret.py --source=file1 --input=file2
+    python interpret.py --source file1 --input file2
     python interpret.py --help
     python interpret.py --version
 
@@ -50,14 +87,25 @@ def error(errcode: int, fname: str = "", addendum: str = "") -> NoReturn:
     :param addendum: Optional string that outputs an extra message in addition to the standard error message.
     :type addendum: str
     '''
-    global errlist
+    message = _ERR_MSGS.get(errcode)
+    if message is None:
+        message = f"Error code {errcode}: unknown error\n"
+
+    if (fname == "") and (addendum == ""):
+        sys.stderr.write(message)
+        sys.exit(errcode)
+
+    parts = []
     if fname != "":
-        print(f"in function '{fname}'", file=sys.stderr)
+        parts.append(f"in function '{fname}'\n")
 
     if addendum != "":
-        print(f"{addendum}", file=sys.stderr)
+        parts.append(f"{addendum}\n")
+
+    parts.append(message)
 
-    print(f"Error code {errcode}: {errlist[errcode]}", file=sys.stderr)
+    # the whole message is written at once
+    sys.stderr.write("".join(parts))
 
     sys.exit(errcode)
 
@@ -66,515 +114,389 @@ class Instruction:
     A class that wraps an instruction into an object and run various checks at initialization.
     :param instruction: A node from the xml reader class.
     :type instruction: et.Element
+    :param frame_slots: Indexed by frame id, maps variable names to their slots in the frames, new names are added.
+    :type frame_slots: tuple
+    :param shared_args: Maps an argument to the same argument tuple already used by another instruction, new arguments are added.
+    :type shared_args: dict
     '''
-    valid_types = ["var", "string", "type", "label", "int", "bool", "nil"]
+    # instructions live for the whole run, slots keep them small
+    __slots__ = ("arg_list", "dependencies", "opcode", "opid", "target", "index")
+
+    valid_types = frozenset(("var", "string", "type", "label", "int", "bool", "nil"))
+    valid_keys = frozenset(("order", "opcode"))
+
+    # string constants repeat a lot in programs, the decoded form is shared between instructions
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def stringify(string):
+        # an empty string argument has no text at all
+        if string is None:
+            return ""
+
+        # most strings have no escapes at all, those are returned without touching the regex
+        index = string.find("\\")
+        if index < 0:
+            return string
 
-    def syntax_checks(self, instruction: et.Element):
+        # every escape sequence is replaced in a single pass over the part from the first backslash
+        return string[:index] + _ESC_RE.sub(_decode_escape, string[index:])
+
+    def create_dependencies(self, instruction: et.Element, frame_slots: tuple, shared_args: dict):
         if instruction.tag != "instruction":
             error(32)
 
-        valid_keys = instruction.attrib.keys()
-        if len(valid_keys) != 2:
+        if set(instruction.attrib) != self.valid_keys:
             error(32)
 
-        if ("order" not in valid_keys) or ("opcode" not in valid_keys):
-            error(32)
+        self.dependencies = []
 
+        # the arguments are checked and collected in a single pass over the xml children
         arg_count = len(instruction)
-        for i, arg in enumerate(instruction):
-            if (arg.tag != f"arg{arg_count}") and (arg.tag != f"arg{i+1}"):
-                error(32)
+        if arg_count > len(_ARG_POSITIONS):
+            error(32)
 
-            arg_count -= 1
-            if "type" not in arg.attrib.keys():
+        add_dependency = self.dependencies.append
+        arg_list = [None] * arg_count
+        for arg in instruction:
+            # the arguments can come in any order, the tag alone decides the position,
+            # so the tags have to be argN with no gaps and no duplicates
+            position = _ARG_POSITIONS.get(arg.tag)
+            if (position is None) or (position >= arg_count) or (arg_list[position] is not None):
                 error(32)
 
-            if arg.attrib["type"] not in self.valid_types:
-                error(32)
-    
-    def stringify(self, string):
-        start = 0
-        while (x := string.find("\\", start)) != -1:
-            o_str = string[x] + string[x+1] + string[x+2] + string[x+3]
-            digit = string[x+1] + string[x+2] + string[x+3]
-            if not digit.isdigit():
-                start = x
-            n_str = chr(int(digit))
-            string = string.replace(o_str, n_str, 1)
-
-        return string
-
-    def create_dependencies(self, instruction: et.Element):
-        self.arg_list = []
-        self.dependencies = []
-        
-        rev = False
-        for i, arg in enumerate(instruction):
-            if i == 0:
-                if (arg.tag == "arg2") or (arg.tag == "arg3"):
-                    rev = True
             text = arg.text
-            attype = arg.attrib["type"]
+            attype = arg.get("type")
+            if attype not in self.valid_types:
+                error(32)
+            # strings compared or hashed on every execution are interned,
+            # so the comparisons can succeed on identity
+            attype = sys.intern(attype)
+
             if text == "":
                 error(99, addendum="expected argument at instruction")
-            
+
+            # only string constants can be empty, a variable, a label or a type needs its name
+            if (text is None) and (attype in ("var", "label", "type")):
+                error(32)
+
             if attype == "var":
-                self.dependencies.append(text)
-                self.arg_list.append((text, attype))
-            elif attype == "type":
-                self.arg_list.append((text, attype))
-            elif attype == "label":
-                self.dependencies.append(text)
-                self.arg_list.append((text, attype))
-            else:
-                if attype == "string":
-                    text = self.stringify(text)
-                self.arg_list.append((text, attype))
-            
-        if rev:
-            self.arg_list = self.arg_list[::-1]
-
-    def __init__(self, instruction: et.Element):
-        self.syntax_checks(instruction)
-        self.create_dependencies(instruction)
-        self.opcode = instruction.attrib["opcode"]
-
-    def print_instruction_info(self) -> None:
-        print(f"opcode: {self.opcode}")
-        print("Dependencies: ", end="")
-        for dependency in self.dependencies:
-            print(dependency, end=", ")
-        print()
-        print("instruction list: ", end="")
-        for literal in self.arg_list:
-            print(literal, end=", ")
-        print("\n")
-
-# a class that implements a dispatch table
+                # the variable is resolved to its frame id and name once here,
+                # so executing the instruction needs no splitting or frame name comparisons
+                try:
+                    frame, name = text.split("@", 1)
+                except ValueError:
+                    error(32)
+                frame_id = _FRAME_IDS.get(frame)
+                if frame_id is None:
+                    error(31)
+                # frames are lists, a variable is resolved to its slot in the frame
+                slots = frame_slots[frame_id]
+                text = (frame_id, slots.setdefault(name, len(slots)))
+                add_dependency(text)
+            elif attype == "string":
+                text = self.stringify(text)
+            # constants are converted to python values once here, the handlers use them as they are
+            elif attype == "int":
+                try:
+                    text = int(text)
+                except (TypeError, ValueError):
+                    error(32)
+            elif attype == "bool":
+                text = _TO_BOOL.get(text.lower()) if text is not None else None
+                if text is None:
+                    error(32)
+            elif attype == "nil":
+                text = None
+
+            parsed = (text, attype)
+            arg_list[position] = shared_args.setdefault(parsed, parsed)
+
+        # the arguments never change after loading, a tuple is smaller than a list
+        self.arg_list = tuple(arg_list)
+
+    def __init__(self, instruction: et.Element, frame_slots: tuple, shared_args: dict):
+        self.create_dependencies(instruction, frame_slots, shared_args)
+        self.opcode = sys.intern(instruction.get("opcode"))
+
+        # the opcode is resolved to its index in the dispatch table once here,
+        # so executing the instruction needs no string lookup
+        self.opid = Operations.opcode_ids.get(self.opcode)
+        if self.opid is None:
+            error(32)
+
+        # the shape of the arguments never changes, so it is validated only once here
+        arg_kinds = Operations.arg_kinds[self.opid]
+        if len(arg_kinds) != len(self.arg_list):
+            error(32)
+
+        for accepted, arg in zip(arg_kinds, self.arg_list):
+            if arg[1] not in accepted:
+                error(32)
+
+# the arithmetic, relational and logic opcodes differ only in the operation,
+# so their handlers are created by these factories, one handler per opcode
+# with the operation (a function from the operator module) already bound
+
+def _make_math(operation) -> Callable:
+    def math_op(self, instruction: Instruction) -> None:
+        self.dependency_check(instruction)
+        arg1 = self.get_frame_value(instruction.arg_list[0][0])
+        arg2 = self.load(instruction.arg_list[1])
+        arg3 = self.load(instruction.arg_list[2])
+
+        if (arg1[1] is not None) and (arg1[1] != "int"):
+            error(53)
+        
+        if arg2[1] != "int":
+            error(53)
+
+        if arg3[1] != "int":
+            error(53)
+        
+        try:
+            result = operation(arg2[0], arg3[0])
+        except ZeroDivisionError:
+            error(57)
+
+        self.set_frame_value(instruction.arg_list[0][0], (result, "int"))
+
+    return math_op
+
+def _make_relation(operation) -> Callable:
+    def relation_op(self, instruction: Instruction) -> None:
+        self.dependency_check(instruction)
+        arg1 = self.get_frame_value(instruction.arg_list[0][0])
+        arg2 = self.load(instruction.arg_list[1])
+        arg3 = self.load(instruction.arg_list[2])
+
+        if (arg1[1] is not None) and (arg1[1] != "bool"):
+            error(53)
+
+        # two uninitialized variables have the same (missing) type, so they are caught first
+        if (arg2[1] is None) or (arg3[1] is None):
+            error(56)
+
+        if arg2[1] != arg3[1]:
+            error(53)
+
+        if arg2[1] == "nil":
+            error(53)
+
+        result = operation(arg2[0], arg3[0])
+        self.set_frame_value(instruction.arg_list[0][0], (result, "bool"))
+
+    return relation_op
+
+def _make_logic(operation) -> Callable:
+    def logic_op(self, instruction: Instruction) -> None:
+        self.dependency_check(instruction)
+        arg1 = self.get_frame_value(instruction.arg_list[0][0])
+        arg2 = self.load(instruction.arg_list[1])
+        arg3 = self.load(instruction.arg_list[2])
+
+        if (arg1[1] is not None) and (arg1[1] != "bool"):
+            error(53)
+
+        if arg2[1] != "bool":
+            error(53)
+
+        if arg3[1] != "bool":
+            error(53)
+
+        result = operation(arg2[0], arg3[0])
+        self.set_frame_value(instruction.arg_list[0][0], (result, "bool"))
+
+    return logic_op
+
+# a mixin class that implements a dispatch table
 class Operations:
     '''
-    A class that implements a dispatch table that chooses how to parse individual opcodes.
-    :param instruction: An Instruction class object.
-    :type instruction: Instruction
+    A mixin class that implements a dispatch table that chooses how to parse individual opcodes.
+    It has no state of its own, the methods work with the resources of the Interpret class that inherits it,
+    so no object has to be created per executed instruction. The resources it uses are listed below.
     :param flow: A FlowControl class object that takes care of the program walkthrough.
     :type flow: FlowControl
     :param data_stack: A stack for holding data, used by stack opcodes.
-    :type data_stack: Stack
+    :type data_stack: list
     :param local_frame_stack: A stack for holding local frames.
-    :type data_stack: Stack
+    :type local_frame_stack: list
     :param call_stack: A stack for holding instruction indexes.
-    :type call_stack: Stack
-    :param global_frame: A dictionary that is used to hold global variables.
-    :type global_frame: dict
+    :type call_stack: array
+    :param global_frame: A list that holds global variables, indexed by the slots from FlowControl.global_slots.
+    Local and temporary frames are lists too, indexed by the slots from FlowControl.local_slots.
+    :type global_frame: list
     :param temporary_frame: A frame that is from the TemporaryFrame class.
     :type temporary_frame: TemporaryFrame
-    :param label_list: A list that hold all avaiable labels.
-    :type label_list: list
+    :param label_list: A dictionary that maps all avaiable labels to their instruction indexes.
+    :type label_list: dict
     '''
-    def frame_exists(self, frame: str) -> None:
-        if frame == "GF":
-            return
-        if frame == "TF":
-            if not self.temporary_frame.exists():
-                error(55)
-        elif frame == "LF":
-            local_frame = self.local_frame_stack.get_top()
-            if local_frame is None:
+    def dependency_check(self, instruction: Instruction) -> None:
+        frames = self.frames
+        for frame, name in instruction.dependencies:
+            variables = frames[frame]
+            if variables is None:
                 error(55)
-        else:
-            error(31)
+            # every variable has its slot in every frame, the slot holds None until the variable is defined
+            if variables[name] is None:
+                error(54)
 
-    def dependency_check(self, instruction: Instruction) -> None:
-        for dp in instruction.dependencies:
-            frame, name = dp.split("@")
-            if frame == "GF":
-                if name not in self.global_frame.keys():
-                    error(54)
-            elif frame == "TF":
-                self.frame_exists("TF")
-                if not self.temporary_frame.exists_var(name):
-                    error(54)
-            elif frame == "LF":
-                self.frame_exists("LF")
-                if name not in self.local_frame_stack.get_top().keys():
-                    error(54)
-            else:
-                error(31)
-
-    def check_arg_types(self, instruction: Instruction, types: str) -> None:
-        for i, arg in enumerate(instruction.arg_list):
-            if arg[1][0] != types[i]:
-                error(53)
-
-    def in_frame(self, name: str, frame: str) -> bool:
-        if frame == "GF":
-            if name in self.global_frame.keys():
-                return True
-        elif frame == "TF":
-            return self.temporary_frame.exists_var(name)
-        elif frame == "LF":
-            if name in self.local_frame_stack.get_top().keys():
-                return True
-        else:
-            error(31)
+    def get_frame_value(self, variable: tuple) -> (Any | tuple):
+        frame, name = variable
+        return self.frames[frame][name]
 
-        return False
+    def set_frame_value(self, variable: tuple, value: tuple) -> None:
+        frame, name = variable
+        self.frames[frame][name] = value
 
-    def get_frame_value(self, instruction: str) -> (Any | tuple):
-        frame, name = instruction.split("@")
-        if frame == "GF":
-            return self.global_frame[name]
-        elif frame == "LF":
-            return self.local_frame_stack.get_top()[name]
-        elif frame == "TF":
-            return self.temporary_frame.get_var(name)
-        
-    def set_frame_value(self, instruction: str, value: tuple) -> None:
-        frame, name = instruction.split("@")
-        if frame == "GF":
-            self.global_frame[name] = value
-        elif frame == "LF":
-            self.local_frame_stack.get_top()[name] = value
-        elif frame == "TF":
-            self.temporary_frame.set_var(name, value)
+    # a symbol is either a variable or a constant, both are loaded as a (value, type) pair
+    def load(self, arg: tuple) -> tuple:
+        if arg[1] == "var":
+            frame, name = arg[0]
+            return self.frames[frame][name]
+        return arg
 
     def move(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
 
         arg1, _ = instruction.arg_list[0]
-        arg2, arg_type2 = instruction.arg_list[1]
-
-        if arg_type2 == "var":
-            arg1_value = self.get_frame_value(arg1)
-            arg2_value = self.get_frame_value(arg2)
-            if arg2_value[1] is None:
-                error(56)
-
-            if (arg1_value[1] is None) or (arg1_value[1] == arg2_value[1]):
-                self.set_frame_value(arg1, arg2_value)
-            else:
-                error(53)
-        elif (arg_type2 == "int") or (arg_type2 == "string") or (arg_type2 == "bool") or (arg_type2 == "nil"):
-            arg1_value = self.get_frame_value(arg1)
+        arg1_value = self.get_frame_value(arg1)
+        arg2_value = self.load(instruction.arg_list[1])
+        if arg2_value[1] is None:
+            error(56)
 
-            if (arg1_value[1] is None) or (arg1_value[1] == arg_type2):
-                self.set_frame_value(arg1, (arg2, arg_type2))
-            else:
-                error(53)
+        if (arg1_value[1] is None) or (arg1_value[1] == arg2_value[1]):
+            self.set_frame_value(arg1, arg2_value)
         else:
             error(53)
 
-    def createframe(self) -> None:
-        self.temporary_frame.set({})
+    def createframe(self, instruction: Instruction) -> None:
+        self.temporary_frame.set([None] * self.frame_size)
+        self.frames[TF] = self.temporary_frame.data
 
-    def pushframe(self) -> None:
+    def pushframe(self, instruction: Instruction) -> None:
         if self.temporary_frame.exists():
             self.local_frame_stack.append(self.temporary_frame.data)
             self.temporary_frame.remove()
+            self.frames[TF] = None
+            self.frames[LF] = self.local_frame_stack[-1]
         else:
             error(55)
 
-    def popframe(self) -> None:
-        if self.local_frame_stack.get_top() is not None:
-            self.temporary_frame.set(self.local_frame_stack.get_top())
-            self.local_frame_stack.pop()
+    def popframe(self, instruction: Instruction) -> None:
+        if self.local_frame_stack:
+            self.temporary_frame.set(self.local_frame_stack.pop())
+            self.frames[TF] = self.temporary_frame.data
+            self.frames[LF] = self.local_frame_stack[-1] if self.local_frame_stack else None
         else:
             error(55)
 
     def defvar(self, instruction: Instruction) -> None:
-        self.check_arg_types(instruction, "v")
-        frame, name = instruction.arg_list[0][0].split("@")
-        self.frame_exists(frame)
+        frame_id, name = instruction.dependencies[0]
+        # the frame is looked up once and used for all the checks
+        frame = self.frames[frame_id]
+        if frame is None:
+            error(55)
 
-        if self.in_frame(name, frame):
+        if frame[name] is not None:
             error(52)
 
-        if frame == "GF":
-            self.global_frame[name] = (None, None)
-        elif frame == "TF":
-            self.temporary_frame.set_var(name, (None, None))
-        elif frame == "LF":
-            self.local_frame_stack.get_top()[name] = (None, None)
-        else:
-            error(31)
-
-    def call(self, instruction: Instruction) -> None:
-        curr_index = self.flow.get_index()
-        self.call_stack.append(curr_index)
+        frame[name] = (None, None)
 
-        label = instruction.arg_list[0]
-        
-        if label[1] != "label":
-            error(57)
-
-        if label[0] not in self.label_list.keys():
-            error(52)
-
-        self.flow.set_index(self.label_list[label[0]])
+    def call(self, instruction: Instruction) -> int:
+        self.call_stack.append(instruction.index + 1)
+        return instruction.target
 
-    def return_(self) -> None:
-        index = self.call_stack.get_top()
-        if index is None:
+    def return_(self, instruction: Instruction) -> int:
+        if not self.call_stack:
             error(56)
-        
-        self.call_stack.pop()
-        self.flow.set_index(index)
+
+        return self.call_stack.pop()
 
     def pushs(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
 
-        arg1, arg_type1 = instruction.arg_list[0]
+        arg1_value = self.load(instruction.arg_list[0])
+        if arg1_value[1] is None:
+            error(56)
 
-        if arg_type1 == "var":
-            arg1_value = self.get_frame_value(arg1)
-            if arg1_value[1] is None:
-                error(56)
-        elif (arg_type1 == "type") or (arg_type1 == "label"):
-            error(53)
-        else:
-            arg1_value = (arg1, arg_type1)
-        
         self.data_stack.append(arg1_value)
 
     def pops(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
-        top_val = self.data_stack.get_top()
-
-        if top_val is None:
+        if not self.data_stack:
             error(56)
+
+        # a failed check ends the interpretation, so the value can be popped right away
+        top_val = self.data_stack.pop()
         
         arg1, _ = instruction.arg_list[0]
         _, arg1_type = self.get_frame_value(arg1)
-        if (top_val[1] != instruction.arg_list[0][1]) and (arg1_type is not None):
-            error(53)
-
-        self.set_frame_value(instruction.arg_list[0][0], top_val)
-
-        self.data_stack.pop()
-        
-    def math_ops(self, instruction: Instruction, ops: str) -> None:
-        self.dependency_check(instruction)
-        arg1 = self.get_frame_value(instruction.arg_list[0][0])
-        arg2 = self.instruction.arg_list[1]
-        arg3 = self.instruction.arg_list[2]
-
-        if (arg1[1] is not None) and (arg1[1] != "int"):
-            error(53)
-        
-        if arg2[1] == "var":
-            arg2 = self.get_frame_value(arg2[0])
-        
-        if arg2[1] != "int":
+        if (top_val[1] != arg1_type) and (arg1_type is not None):
             error(53)
 
-        if arg3[1] == "var":
-            arg3 = self.get_frame_value(arg3[0])
-        
-        if arg3[1] != "int":
-            error(53)
-        
-        op = ops[0]
-        try:
-            if op == "+":
-                result = int(arg2[0]) + int(arg3[0])
-            elif op == "-":
-                result = int(arg2[0]) - int(arg3[0])
-            elif op == "*":
-                result = int(arg2[0]) * int(arg3[0])
-            elif op == "/":
-                result = int(arg2[0]) // int(arg3[0])
-            else:
-                error(99, addendum="Unknown operation type")
-        except ValueError:
-            error(32)
-        except ZeroDivisionError:
-            error(57)
-
-        self.set_frame_value(instruction.arg_list[0][0], (result, "int"))
+        self.set_frame_value(arg1, top_val)
 
-    def relation_ops(self, instruction: Instruction, ops: str) -> None:
+    def eq_(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
         arg1 = self.get_frame_value(instruction.arg_list[0][0])
-        arg2 = self.instruction.arg_list[1]
-        arg3 = self.instruction.arg_list[2]
+        arg2 = self.load(instruction.arg_list[1])
+        arg3 = self.load(instruction.arg_list[2])
 
         if (arg1[1] is not None) and (arg1[1] != "bool"):
             error(53)
 
-        if arg2[1] == "var":
-            arg2 = self.get_frame_value(arg2[0])
-
-        if arg3[1] == "var":
-            arg3 = self.get_frame_value(arg3[0])
-        
-        op = ops[0]
-        if op == "==":
-            self.eq(instruction, arg2, arg3)
-            return
-
-        if arg2[1] != arg3[1]:
-            error(53)
-        
-        args_type = arg2[1]
-
-        if (args_type == "nil") or (args_type == "lable") or (arg2[1] == "type"):
-            error(53)
-        
-        try:
-            if args_type == "int":
-                arg2 = int(arg2[0])
-                arg3 = int(arg3[0])
-            elif args_type == "bool":
-                arg2 = eval(str(arg2[0]).lower().capitalize())
-                arg3 = eval(str(arg3[0]).lower().capitalize())
-            else:
-                arg2 = arg2[0]
-                arg3 = arg3[0]
-        except ValueError:
-            error(32)
-
-        result = False
-        if op == ">":
-            result = arg2 > arg3
-        elif op == "<":
-            result = arg2 < arg3
-        else:
-            error(99, addendum="Unknown operation type")
-
-        self.set_frame_value(instruction.arg_list[0][0], (result, "bool"))
-    
-    def eq(self, instruction, arg2, arg3) -> None:
-        arg2_type = arg2[1]
-        arg3_type = arg3[1]
-
-        if (arg2[1] != arg3[1]) and ((arg2[1] != "nil") and (arg3[1] != "nil")):
-            error(53)
-        
-        try:
-            if arg2[1] == "string":
-                arg2 = arg2[0]
-            elif arg2[1] == "bool":
-                arg2 = eval(str(arg2[0]).lower().capitalize())
-            elif arg2[1] == "int":
-                arg2 = int(arg2[0])
-
-            if arg3[1] == "string":
-                arg3 = arg3[0]
-            elif arg3[1] == "bool":
-                arg3 = eval(str(arg3[0]).lower().capitalize())
-            elif arg3[1] == "int":
-                arg3 = int(arg3[0])
-        except ValueError:
-            error(32)
-
-        if (arg2_type == "nil") and (arg3_type == "nil"):
-            result = True
-        elif (arg2_type == "nil") or (arg3_type == "nil"):
-            result = False
-        else:
-            result = arg2 == arg3
-
+        result = self.j_eq(arg2, arg3)
         self.set_frame_value(instruction.arg_list[0][0], (result, "bool"))
 
-    def and_or(self, instruction: Instruction, ops) -> None:
-        self.dependency_check(instruction)
-        arg1 = self.get_frame_value(instruction.arg_list[0][0])
-        arg2 = self.instruction.arg_list[1]
-        arg3 = self.instruction.arg_list[2]
-
-        if (arg1[1] is not None) and (arg1[1] != "bool"):
-            error(53)
-
-        if arg2[1] == "var":
-            arg2 = self.get_frame_value(arg2[0])
-
-        if arg2[1] != "bool":
-            error(53)
-
-        if arg3[1] == "var":
-            arg3 = self.get_frame_value(arg3[0])
-
-        if arg3[1] != "bool":
-            error(53)
-
-        op = ops[0]
-        try:
-            if op == "and":
-                result = eval(str(arg2[0]).lower().capitalize()) and eval(str(arg3[0]).lower().capitalize())
-            elif op == "or":
-                result = eval(str(arg2[0]).lower().capitalize()) or eval(str(arg3[0]).lower().capitalize())
-            else:
-                error(99, addendum="Unknown operation type")
-        except ValueError:
-            error(32)
-
-        self.set_frame_value(instruction.arg_list[0][0], (result, "bool"))
- 
     def not_(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
         arg1 = self.get_frame_value(instruction.arg_list[0][0])
-        arg2 = self.instruction.arg_list[1]
+        arg2 = self.load(instruction.arg_list[1])
 
         if (arg1[1] is not None) and (arg1[1] != "bool"):
             error(53)
 
-        if arg2[1] == "var":
-            arg2 = self.get_frame_value(arg2[0])
-
         if arg2[1] != "bool":
             error(53)
        
-        try:
-            result = not bool(arg2[0].lower().capitalize())
-        except ValueError:
-            error(32)
+        result = not arg2[0]
 
         self.set_frame_value(instruction.arg_list[0][0], (result, "bool"))
         
     def int2char(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
         arg1 = self.get_frame_value(instruction.arg_list[0][0])
-        arg2 = self.instruction.arg_list[1]
+        arg2 = self.load(instruction.arg_list[1])
 
         if (arg1[1] is not None) and (arg1[1] != "string"):
             error(53)
         
-        if arg2[1] == "var":
-            arg2 = self.get_frame_value(arg2[0])
-        
         if arg2[1] != "int":
             error(58)
+        # the value is already an int, chr() only fails when it is not a valid code point
         try:
-            result = chr(int(arg2[0]))
-        except ValueError:
-            error(32)
+            result = chr(arg2[0])
+        except (ValueError, OverflowError):
+            error(58)
 
         self.set_frame_value(instruction.arg_list[0][0], (result, "string"))
 
     def stri2int(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
         arg1 = self.get_frame_value(instruction.arg_list[0][0])
-        arg2 = self.instruction.arg_list[1]
-        arg3 = self.instruction.arg_list[2]
+        arg2 = self.load(instruction.arg_list[1])
+        arg3 = self.load(instruction.arg_list[2])
 
         if (arg1[1] is not None) and (arg1[1] != "int"):
             error(53)
         
-        if arg2[1] == "var":
-            arg2 = self.get_frame_value(arg2[0])
-        
         if arg2[1] != "string":
             error(53)
 
-        if arg3[1] == "var":
-            arg3 = self.get_frame_value(arg3[0])
-        
         if arg3[1] != "int":
             error(53)
         try:
-            result = ord(arg2[0][int(arg3[0])])
-        except ValueError:
-            error(32)
+            result = ord(arg2[0][arg3[0]])
         except IndexError:
             error(58)
 
@@ -586,36 +508,27 @@ class Operations:
 
     def write(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
-        arg1 = self.instruction.arg_list[0]
-
-        if arg1[1] == "var":
-            arg1 = self.get_frame_value(arg1[0])
+        arg1 = self.load(instruction.arg_list[0])
 
         if arg1[1] == "nil":
             print("", end="")
         elif arg1[1] == "bool":
-            print(str(arg1[0].lower()), end="")
+            print("true" if arg1[0] else "false", end="")
         else:
             print(arg1[0], end="")
 
     def concat(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
         arg1 = self.get_frame_value(instruction.arg_list[0][0])
-        arg2 = self.instruction.arg_list[1]
-        arg3 = self.instruction.arg_list[2]
+        arg2 = self.load(instruction.arg_list[1])
+        arg3 = self.load(instruction.arg_list[2])
 
         if (arg1[1] is not None) and (arg1[1] != "string"):
             error(53)
         
-        if arg2[1] == "var":
-            arg2 = self.get_frame_value(arg2[0])
-        
         if arg2[1] != "string":
             error(53)
 
-        if arg3[1] == "var":
-            arg3 = self.get_frame_value(arg3[0])
-        
         if arg3[1] != "string":
             error(53)
 
@@ -625,14 +538,11 @@ class Operations:
     def strlen(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
         arg1 = self.get_frame_value(instruction.arg_list[0][0])
-        arg2 = self.instruction.arg_list[1]
+        arg2 = self.load(instruction.arg_list[1])
 
         if (arg1[1] is not None) and (arg1[1] != "int"):
             error(53)
         
-        if arg2[1] == "var":
-            arg2 = self.get_frame_value(arg2[0])
-        
         if arg2[1] != "string":
             error(53)
 
@@ -642,27 +552,19 @@ class Operations:
     def getchar(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
         arg1 = self.get_frame_value(instruction.arg_list[0][0])
-        arg2 = self.instruction.arg_list[1]
-        arg3 = self.instruction.arg_list[2]
+        arg2 = self.load(instruction.arg_list[1])
+        arg3 = self.load(instruction.arg_list[2])
 
         if (arg1[1] is not None) and (arg1[1] != "string"):
             error(53)
         
-        if arg2[1] == "var":
-            arg2 = self.get_frame_value(arg2[0])
-        
         if arg2[1] != "string":
             error(53)
 
-        if arg3[1] == "var":
-            arg3 = self.get_frame_value(arg3[0])
-        
         if arg3[1] != "int":
             error(53)
         try:
-            result = arg2[0][int(arg3[0])]
-        except ValueError:
-            error(32)
+            result = arg2[0][arg3[0]]
         except IndexError:
             error(58)
 
@@ -671,50 +573,37 @@ class Operations:
     def setchar(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
         arg1 = self.get_frame_value(instruction.arg_list[0][0])
-        arg2 = self.instruction.arg_list[1]
-        arg3 = self.instruction.arg_list[2]
+        arg2 = self.load(instruction.arg_list[1])
+        arg3 = self.load(instruction.arg_list[2])
 
         if arg1[1] != "string":
             error(53)
         
-        if arg2[1] == "var":
-            arg2 = self.get_frame_value(arg2[0])
-        
         if arg2[1] != "int":
             error(53)
 
-        if arg3[1] == "var":
-            arg3 = self.get_frame_value(arg3[0])
-        
         if arg3[1] != "string":
             error(53)
 
-        try:
-            index = int(arg2[0])
-            r_as = arg3[0][0]
-            
-            result_1 = arg1[0][:index]
-            result_2 = arg1[0][index+1:]
-
-            result = result_1 + r_as + result_2
-        except ValueError:
-            error(32)
-        except IndexError:
+        string = arg1[0]
+        index = arg2[0]
+        # slicing never fails, so the index and the replacement are checked up front
+        if (index < 0) or (index >= len(string)) or (arg3[0] == ""):
             error(58)
 
+        # python strings are immutable, the result is built with a single concatenation
+        result = string[:index] + arg3[0][0] + string[index+1:]
+
         self.set_frame_value(instruction.arg_list[0][0], (result, "string"))
 
     def type_(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
         arg1 = self.get_frame_value(instruction.arg_list[0][0])
-        arg2 = self.instruction.arg_list[1]
+        arg2 = self.load(instruction.arg_list[1])
 
         if (arg1[1] is not None) and (arg1[1] != "string"):
             error(53)
 
-        if arg2[1] == "var":
-            arg2 = self.get_frame_value(arg2[0])
-        
         if arg2[1] is None:
             self.set_frame_value(instruction.arg_list[0][0], ("", "string"))
         else:
@@ -723,16 +612,8 @@ class Operations:
     def label(self, instruction: Instruction) -> None:
         pass
 
-    def jump(self, instruction: Instruction) -> None:
-        label = instruction.arg_list[0]
-        
-        if label[1] != "label":
-            error(57)
-
-        if label[0] not in self.label_list.keys():
-            error(52)
-
-        self.flow.set_index(self.label_list[label[0]])
+    def jump(self, instruction: Instruction) -> int:
+        return instruction.target
 
     def j_eq(self, arg2, arg3):
         arg2_type = arg2[1]
@@ -741,77 +622,43 @@ class Operations:
         if (arg2[1] != arg3[1]) and ((arg2[1] != "nil") and (arg3[1] != "nil")):
             error(53)
         
-        try:
-            if arg2[1] == "string":
-                arg2 = arg2[0]
-            elif arg2[1] == "bool":
-                arg2 = eval(str(arg2[0]).lower().capitalize())
-            elif arg2[1] == "int":
-                arg2 = int(arg2[0])
-
-            if arg3[1] == "string":
-                arg3 = arg3[0]
-            elif arg3[1] == "bool":
-                arg3 = eval(str(arg3[0]).lower().capitalize())
-            elif arg3[1] == "int":
-                arg3 = int(arg3[0])
-        except ValueError:
-            error(32)
-
         if (arg2_type == "nil") and (arg3_type == "nil"):
             result = True
         elif (arg2_type == "nil") or (arg3_type == "nil"):
             result = False
         else:
-            result = arg2 == arg3
+            result = arg2[0] == arg3[0]
         
         return result
 
-    def jumpifeq(self, instruction: Instruction) -> None:
-        arg2 = self.instruction.arg_list[1]
-        arg3 = self.instruction.arg_list[2]
-
-        if arg2[1] == "var":
-            arg2 = self.get_frame_value(arg2[0])
-
-        if arg3[1] == "var":
-            arg3 = self.get_frame_value(arg3[0])
+    def jumpifeq(self, instruction: Instruction) -> (int | None):
+        self.dependency_check(instruction)
+        arg2 = self.load(instruction.arg_list[1])
+        arg3 = self.load(instruction.arg_list[2])
 
         result = self.j_eq(arg2, arg3)
 
         if result:
-            self.jump(instruction)
-
-    def jumpifneq(self, instruction: Instruction) -> None:
-        arg2 = self.instruction.arg_list[1]
-        arg3 = self.instruction.arg_list[2]
-
-        if arg2[1] == "var":
-            arg2 = self.get_frame_value(arg2[0])
+            return self.jump(instruction)
 
-        if arg3[1] == "var":
-            arg3 = self.get_frame_value(arg3[0])
+    def jumpifneq(self, instruction: Instruction) -> (int | None):
+        self.dependency_check(instruction)
+        arg2 = self.load(instruction.arg_list[1])
+        arg3 = self.load(instruction.arg_list[2])
 
         result = not self.j_eq(arg2, arg3)
 
         if result:
-            self.jump(instruction)
+            return self.jump(instruction)
 
     def exit_(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
-        arg1 = self.instruction.arg_list[0]
+        arg1 = self.load(instruction.arg_list[0])
 
-        if arg1[1] == "var":
-            arg1 = self.get_frame_value(arg1[0])
-        
         if arg1[1] != "int":
             error(53)
         
-        try:
-            errcode = int(arg1[0])
-        except ValueError:
-            error(32)
-
+        errcode = arg1[0]
         if (errcode < 0) or (errcode > 49):
             error(57)
 
@@ -819,98 +666,93 @@ class Operations:
 
     def dprint(self, instruction: Instruction) -> None:
         self.dependency_check(instruction)
-        arg1 = self.instruction.arg_list[0]
+        arg1 = self.load(instruction.arg_list[0])
 
-        if arg1[1] == "var":
-            arg1 = self.get_frame_value(arg1[0])
-        
-        print(arg1[0], file=sys.stderr, end="")
+        # nil and bool values are stored as python values, they are printed the way they are written
+        if arg1[1] == "nil":
+            print("nil", file=sys.stderr, end="")
+        elif arg1[1] == "bool":
+            print("true" if arg1[0] else "false", file=sys.stderr, end="")
+        else:
+            print(arg1[0], file=sys.stderr, end="")
         
-    def break_(self) -> None:
-        index = self.flow.get_index()-1  # current position
+    def break_(self, instruction: Instruction) -> None:
+        index = instruction.index  # current position
         ins_list = self.flow.get_instructions()
         position = ins_list[index]
         
-        print(f"\nPosition at order [{position[0]}] {position[1].attrib['opcode']}", file=sys.stderr)
-        print(f"Global Frame: {self.global_frame}", file=sys.stderr)
+        # the debug printers are in their own module, loaded only when a program breaks
+        from debug import named_variables, print_frame, print_stack
+
+        print(f"\nPosition at order [{position[0]}] {position[1].opcode}", file=sys.stderr)
+        print(f"Global Frame: {named_variables(self.global_frame, self.flow.global_slots)}", file=sys.stderr)
         print("Temporary Frame: ", file=sys.stderr, end="")
-        self.temporary_frame.print_frame(out="stderr")
+        print_frame(self.temporary_frame, self.flow.local_slots, out="stderr")
         print("Local frame stack: ", file=sys.stderr, end="")
-        self.local_frame_stack.print_stack(out="stderr")
+        print_stack([named_variables(frame, self.flow.local_slots) for frame in self.local_frame_stack], out="stderr")
         print(f"Performed instructions: {index+1}\n", file=sys.stderr)
 
+    # opcode -> (argument kinds, handler)
+    # the kinds are: v - variable, s - symbol (variable or constant), l - label, t - type
     dispatch_table = {
-        'MOVE': (2, move),
-        'CREATEFRAME': (0, createframe),
-        'PUSHFRAME': (0, pushframe),
-        'POPFRAME': (0, popframe),
-        'DEFVAR': (1, defvar),
-        'CALL': (1, call),
-        'RETURN': (0, return_),
-        'PUSHS': (1, pushs),
-        'POPS': (1, pops),
-        'ADD': (3, math_ops, '+'),
-        'SUB': (3, math_ops, '-'),
-        'MUL': (3, math_ops, '*'),
-        'IDIV': (3, math_ops, '/'),
-        'LT': (3, relation_ops, '<'),
-        'GT': (3, relation_ops, '>'),
-        'EQ': (3, relation_ops, '=='),
-        'AND': (3, and_or, "and"),
-        'OR': (3, and_or, "or"),
-        'NOT': (2, not_),
-        'INT2CHAR': (2, int2char),
-        'STRI2INT': (3, stri2int),
-        'READ': (2, read),
-        'WRITE': (1, write),
-        'CONCAT': (3, concat),
-        'STRLEN': (2, strlen),
-        'GETCHAR': (3, getchar),
-        'SETCHAR': (3, setchar),
-        'TYPE': (2, type_),
-        'JUMP': (1, jump),
-        'JUMPIFEQ': (3, jumpifeq),
-        'JUMPIFNEQ': (3, jumpifneq),
-        'EXIT': (1, exit_),
-        'DPRINT': (1, dprint),
-        'BREAK': (0, break_)
+        'MOVE': ("vs", move),
+        'CREATEFRAME': ("", createframe),
+        'PUSHFRAME': ("", pushframe),
+        'POPFRAME': ("", popframe),
+        'DEFVAR': ("v", defvar),
+        'CALL': ("l", call),
+        'RETURN': ("", return_),
+        'PUSHS': ("s", pushs),
+        'POPS': ("v", pops),
+        'ADD': ("vss", _make_math(operator.add)),
+        'SUB': ("vss", _make_math(operator.sub)),
+        'MUL': ("vss", _make_math(operator.mul)),
+        'IDIV': ("vss", _make_math(operator.floordiv)),
+        'LT': ("vss", _make_relation(operator.lt)),
+        'GT': ("vss", _make_relation(operator.gt)),
+        'EQ': ("vss", eq_),
+        'AND': ("vss", _make_logic(operator.and_)),
+        'OR': ("vss", _make_logic(operator.or_)),
+        'NOT': ("vs", not_),
+        'INT2CHAR': ("vs", int2char),
+        'STRI2INT': ("vss", stri2int),
+        'READ': ("vt", read),
+        'WRITE': ("s", write),
+        'CONCAT': ("vss", concat),
+        'STRLEN': ("vs", strlen),
+        'GETCHAR': ("vss", getchar),
+        'SETCHAR': ("vss", setchar),
+        'TYPE': ("vs", type_),
+        'LABEL': ("l", label),
+        'JUMP': ("l", jump),
+        'JUMPIFEQ': ("lss", jumpifeq),
+        'JUMPIFNEQ': ("lss", jumpifneq),
+        'EXIT': ("s", exit_),
+        'DPRINT': ("s", dprint),
+        'BREAK': ("", break_)
     }
 
-    def __init__(self, instruction, flow, data_stack, local_frame_stack, global_frame, temporary_frame, label_list, call_stack):
-        self.instruction = instruction
-        self.flow = flow
-        self.data_stack = data_stack
-        self.local_frame_stack = local_frame_stack
-        self.global_frame = global_frame
-        self.temporary_frame = temporary_frame
-        self.label_list = label_list
-        self.call_stack = call_stack
+    # opcode -> its position in the dispatch table, stored in Instruction.opid
+    opcode_ids = {opcode: i for i, opcode in enumerate(dispatch_table)}
 
-    def run_instruction(self):
-        if self.instruction.opcode == "LABEL":
-            return
+    # the argument kinds of each opcode turned into sets of accepted argument types, indexed by opid
+    arg_kinds = [tuple(_ARG_KINDS[kind] for kind in entry[0]) for entry in dispatch_table.values()]
 
-        try:
-            arg, fce, *argv = self.dispatch_table[self.instruction.opcode]
-        except KeyError:
-            error(32)
+    # creates the list of bound handler methods indexed by Instruction.opid
+    def bind_handlers(self) -> None:
+        self.handlers = [entry[1].__get__(self) for entry in self.dispatch_table.values()]
 
-        if arg != len(self.instruction.arg_list):
-            error(32)
-        
-        if arg == 0:
-            fce(self)
-        elif arg == 3:
-            if argv == []:
-                fce(self, self.instruction)
-            else:
-                fce(self, self.instruction, argv)
-        else:
-            fce(self, self.instruction)
+    # lowers the program to parallel lists indexed by the instruction index,
+    # the handler to call and the instruction it gets
+    def lower_program(self) -> None:
+        self.instructions = tuple(instruction for _, instruction in self.flow.get_instructions())
+        for index, instruction in enumerate(self.instructions):
+            instruction.index = index
+        self.code = [self.handlers[instruction.opid] for instruction in self.instructions]
 
 
 # Façade class for the whole interpret subsystem
-class Interpret:
+class Interpret(Operations):
     '''
     A Façade style class from the Façade design pattern.
     This class combines together all the other classes and uses their resources to interpret the code.
@@ -920,116 +762,55 @@ class Interpret:
     :param ifile: A file that holds the user input values that can be used durring interpretation.
     :type ifile: str
     '''
-    def get_all_labels(self) -> None:
-        self.label_list = {}
-        for i, instruction in enumerate(self.flow.get_instructions()):
-            try:
-                if instruction[1].attrib["opcode"] == "LABEL":
-                    if instruction[1].find("arg1").text in self.label_list.keys():
-                        error(52)
-
-                    self.label_list[instruction[1].find("arg1").text] = i
-            except KeyError:
-                error(32)
-
     def __init__(self, sfile, ifile) -> None:
         self.ifile = ifile
 
         self.flow = FlowControl(sfile)
         self.flow.initialize()
 
-        self.data_stack = Stack()
-        self.local_frame_stack = Stack()
-        self.call_stack = Stack()
+        self.data_stack = []
+        self.local_frame_stack = []
+        # the call stack only ever holds instruction indexes, a typed array stores them unboxed
+        self.call_stack = array("l")
 
-        self.global_frame = {}
-        self.temporary_frame = TemporaryFrame()
+        # every global variable of the program already has its slot, None marks an undefined one
+        self.global_frame = [None] * len(self.flow.global_slots)
+        # the same holds for local and temporary frames, they all have the size of the local slots
+        self.frame_size = len(self.flow.local_slots)
+        self.temporary_frame = TemporaryFrame(self.frame_size)
         
-        self.get_all_labels()
-
-    def interpret(self) -> None:
-        while (ins := self.flow.next_instruction()) != -1:
-            instruction_obj = Instruction(ins[1])
-            operation = Operations(instruction_obj, self.flow, self.data_stack, self.local_frame_stack, self.global_frame, self.temporary_frame, self.label_list, self.call_stack)
-            operation.run_instruction()
-
-    def print_everything(self) -> None:
-        print(f"Input file: {self.ifile}")
-
-        print("Data stack: ", end="")
-        self.data_stack.print_stack()
+        self.label_list = self.flow.label_list
 
-        print("Frame stack: ", end="")
-        self.local_frame_stack.print_stack()
+        # frame id -> currently accessible frame (None if it does not exist),
+        # kept up to date by createframe, pushframe and popframe
+        self.frames = [self.global_frame, None, None]
 
-        print("global frame: ", end="")
-        print(self.global_frame)
+        self.bind_handlers()
+        self.lower_program()
 
-        print("Temporary frame: ", end="")
-        self.temporary_frame.print_frame()
-
-        print(f"Label list: {self.label_list}")
-
-        print("Call stack: ", end="")
-        self.call_stack.print_stack()
-
-class Stack:
-    '''
-    A class that represents a stack.
-    All normalized stack operations are present.
-    '''
-    def __init__(self) -> None:
-        self.stack = []
-        self._last_elem = None
-        self._first_elem = None
-
-    def append(self, item: Any) -> None:
-        self.stack.append(item)
-        if self._first_elem is None:
-            self._first_elem = item
-        self._last_elem = item
-
-    def pop(self) -> None:
-        try:
-            self.stack.pop()
-            self._last_elem = self.stack[-1]
-        except IndexError:
-            self._last_elem = self._first_elem = None
-
-    def get_top(self) -> (Any | None):
-        return self._last_elem
-
-    def print_stack(self, out="cout") -> None:
-        if out == "cout":
-            fd = sys.stdout
-        else:
-            fd = sys.stderr
-
-        print("[", end="", file=fd)
-
-        last = len(self.stack)-1
-        for i, item in enumerate(self.stack):
-            if item is self._first_elem:
-                print("first element -> ", end="", file=fd)
-            print(item, end=" ")
-            if item is self._last_elem:
-                print("<- last element", end="", file=fd)
-
-            if i != last:
-                print(", ", end=" ", file=fd)
-
-        print("] ", file=fd)
+    def interpret(self) -> None:
+        # the loop only works with local names and the lowered program lists,
+        # a handler that moves the execution (a jump, a call or a return) returns the next index,
+        # the others return None, the returned index is never 0, so 'or' can tell them apart
+        code = self.code
+        instructions = self.instructions
+        count = len(code)
+        index = 0
+        while index < count:
+            index = code[index](instructions[index]) or index + 1
 
 class TemporaryFrame():
     '''
     A class that implements a temporary frame.
     This is done with a class so that the program is able to specify that the temporary frame is uninitialized.
+    :param size: The number of variable slots in a frame.
+    :type size: int
     '''
-    def __init__(self) -> None:
+    def __init__(self, size: int) -> None:
         self._initialized = False
-        self.data = {}
+        self.data = [None] * size
 
-    def set(self, frame: dict) -> None:
+    def set(self, frame: list) -> None:
         self._initialized = True
         self.data = frame
     
@@ -1039,30 +820,6 @@ class TemporaryFrame():
     def remove(self) -> None:
         self._initialized = False
 
-    def set_var(self, name: str, value: tuple) -> None:
-        self.data[name] = value
-
-    def exists_var(self, name: str) -> bool:
-        return name in self.data.keys()
-
-    def get_var(self, name: str) -> (Any | None):
-        if self.exists_var(name):
-            return self.data[name]
-        else:
-            return None
-
-    def print_frame(self, out="cout") -> None:
-        if out == "cout":
-            fd = sys.stdout
-        else:
-            fd = sys.stderr
-
-        print(self.data, end="", file=fd)
-        if self._initialized:
-            print(" <- initialized", file=fd)
-        else:
-            print(" <- uninitialized", file=fd)
-
 class FlowControl:
     '''
     A class that implements the control of flow ie. instruction order durring interpretation.
@@ -1074,49 +831,112 @@ class FlowControl:
         self.init = False
 
     def initialize(self):
+        # imported only here, so --help and --version do not have to load the xml parser
+        try:
+            from lxml import etree as et
+            # blank text between elements is never used and comments are dropped like the
+            # standard parser does, huge_tree lifts the libxml2 limits for very large programs
+            parser_options = {"remove_blank_text": True, "remove_comments": True, "huge_tree": True}
+        except ImportError:
+            import xml.etree.ElementTree as et
+            parser_options = {}
+
         self.init = True
         if self.xml_file == "stdin":
-            file = []
-            while True:
-                try:
-                    line = input()
-                    file.append(line)
-                except EOFError:
-                    break
-
-            stdin = "".join(file)
-            self.root = et.fromstring(stdin)
+            # read at once as bytes, so the parser gets the newlines and decodes the text itself
+            source = io.BytesIO(sys.stdin.buffer.read())
         else:
-            try:
-                self.tree = et.parse(self.xml_file)
-                self.root = self.tree.getroot()
-            except et.ParseError:
-                error(31)
-
+            source = self.xml_file
+
+        # the source is streamed, every instruction is turned into an Instruction object
+        # as soon as it is read and its xml subtree is released right after
+        pairs = []
+        # variable name -> its slot in the frame, filled while the instructions are created,
+        # local and temporary frames share the slots, because a temporary frame becomes a local one
+        self.global_slots = {}
+        self.local_slots = {}
+        # indexed by the frame ids GF, LF and TF
+        frame_slots = (self.global_slots, self.local_slots, self.local_slots)
+        # argument -> the same argument tuple already used by another instruction,
+        # the same constants and variables repeat a lot, so the instructions share one tuple for each
+        shared_args = {}
+        seen = set()
+        # the orders usually come already ascending, then the sort can be skipped
+        is_sorted = True
+        last = 0
+        root = None
+        depth = 0
         try:
-            if self.root.attrib["language"] != "IPPcode23":
-                error(32)
-        except KeyError:
-            error(31)
-
-        inst_dict = OrderedDict()
-        for instruction in self.root:
-            try:
-                order = int(instruction.attrib["order"])
-                if order in inst_dict.keys():
+            for event, elem in et.iterparse(source, events=("start", "end"), **parser_options):
+                if event == "start":
+                    if root is None:
+                        root = elem
+                        if root.tag != "program":
+                            error(32)
+                        language = root.get("language")
+                        if language is None:
+                            error(31)
+                        elif language != "IPPcode23":
+                            error(32)
+                    depth += 1
+                    continue
+
+                depth -= 1
+                # only direct children of the root element are instructions
+                if depth != 1:
+                    continue
+
+                # a missing order attribute makes int() raise TypeError
+                try:
+                    order = int(elem.get("order"))
+                except (TypeError, ValueError):
                     error(32)
-                elif order <= 0:
+
+                if (order <= 0) or (order in seen):
                     error(32)
-                inst_dict[order] = instruction
-            except KeyError:
-                error(32)
-            except ValueError:
-                error(32)
+                seen.add(order)
+                if order < last:
+                    is_sorted = False
+                last = order
+                pairs.append((order, Instruction(elem, frame_slots, shared_args)))
+
+                elem.clear()
+                root.remove(elem)
+        except et.ParseError:
+            error(31)
+
+        if not is_sorted:
+            pairs.sort(key=operator.itemgetter(0))
+        self._sorted_ins = pairs
+
+        # label name -> index of its LABEL instruction, collected in the same single pass
+        # over the built instructions that resolves the labels of jumps and calls,
+        # a jump to a label that is not known yet is patched once the pass is over,
+        # the target of a jump or a call is the instruction right after the LABEL (the label itself
+        # does nothing), so a target is never 0 and the main loop can test it for truth
+        self.label_list = {}
+        label_id = Operations.opcode_ids["LABEL"]
+        forward_jumps = []
+        for i, (_, instruction) in enumerate(self._sorted_ins):
+            if not instruction.arg_list or (instruction.arg_list[0][1] != "label"):
+                continue
+
+            name = instruction.arg_list[0][0]
+            if instruction.opid == label_id:
+                if name in self.label_list:
+                    error(52)
+                self.label_list[name] = i
+            elif name in self.label_list:
+                instruction.target = self.label_list[name] + 1
+            else:
+                forward_jumps.append(instruction)
 
-        self._index = 0
-        self._sorted_ins = []
-        for key in sorted(inst_dict):
-            self._sorted_ins.append((key, inst_dict[key]))
+        # a jump to an undefined label is reported before anything is executed
+        for instruction in forward_jumps:
+            target = self.label_list.get(instruction.arg_list[0][0])
+            if target is None:
+                error(52)
+            instruction.target = target + 1
 
     # plural
     def get_instructions(self) -> list:
@@ -1124,62 +944,44 @@ class FlowControl:
             error(99, addendum="flow control was not initialized before use")
         return self._sorted_ins
 
-    def print_instructions(self):
-        if not self.init:
-            error(99, addendum="flow control was not initialized before use")
-
-        for i, instruction in enumerate(self._sorted_ins):
-            print(f"[{i}]", end=" ")
-            print(instruction[0], end=" ")
-            print(instruction[1].attrib["opcode"])
-
-    def next_instruction(self):
-        if not self.init:
-            error(99, addendum="flow control was not initialized before use")
-        try:
-            ins = self._sorted_ins[self._index]
-        except IndexError:
-            ins = -1
-
-        self._index += 1
-        return ins
-
-    def set_index(self, new_index):
-        self._index = new_index
-
-    def get_index(self):
-        index = self._index
-        if index < 0:
-            error(99, addendum="instruction pointer index out of range")
-        return index
-
 def main() -> NoReturn:
-    try:
-        # written like this so we skip the first arg variable which is the name
-        oplist, args = getopt.getopt(sys.argv[1:], '', ['help', 'version', 'source=', 'input='])
-        if args != []:
-            error(10)
-    except getopt.GetoptError as err:
-        error(10, addendum=err.msg)
+    # the options are simple enough to be parsed by hand, the first argument is the script name
+    oplist = []
+    args = iter(sys.argv[1:])
+    for arg in args:
+        option, eq, optarg = arg.partition("=")
+        if option in ("--source", "--input"):
+            # the file is either after '=' or in the next argument
+            if eq == "":
+                optarg = next(args, None)
+                if optarg is None:
+                    error(10, addendum=f"option {arg} requires a file")
+            oplist.append((option, optarg))
+        elif (option in ("--help", "--version")) and (eq == ""):
+            oplist.append((option, ""))
+        else:
+            error(10, addendum=f"option {arg} not recognized")
 
-    sfile = ifile = "stdin"
-    for option, optarg in oplist:
-        if option == "--source":
-            sfile = optarg
-        elif option == "--input":
-            ifile = optarg
-        elif option == "--version":
+    # options that do not need any input are handled before anything else is set up
+    for option, _ in oplist:
+        if option == "--version":
             print(f"{sys.argv[0]}: {VERSION}")
             sys.exit(0)
         elif option == "--help":
             print(usage_dialog)
             sys.exit(0)
+
+    # only --source and --input are left in the list at this point
+    sfile = ifile = "stdin"
+    for option, optarg in oplist:
+        if option == "--source":
+            sfile = optarg
         else:
-            print(f"Unhandled option: '{option}'")
-            error(10)
+            ifile = optarg
 
+    # either file can come from stdin, but not both of them
     if (sfile == "stdin") and (ifile == "stdin"):
-        error(10)
+        error(10, addendum="at least one of --source and --input has to be given")
 
     interpret = Interpret(sfile, ifile)
     interpret.interpret()
@@ -0,0 +1,118 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from interpret import Interpret
+
+# smoke tests that run small IPPcode23 programs through the whole interpreter,
+# run them with: python tests/interpret_test.py
+
+def program(*instructions) -> str:
+    '''
+    Builds the xml representation of a program.
+    :param instructions: Each one is an opcode followed by (type, text) pairs of its arguments.
+    :type instructions: tuple
+    '''
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<program language="IPPcode23">']
+    for order, (opcode, *args) in enumerate(instructions, start=1):
+        lines.append(f'  <instruction order="{order}" opcode="{opcode}">')
+        for i, (attype, text) in enumerate(args, start=1):
+            lines.append(f'    <arg{i} type="{attype}">{escape(text)}</arg{i}>')
+        lines.append('  </instruction>')
+    lines.append('</program>')
+    return "\n".join(lines)
+
+class InterpretTest(unittest.TestCase):
+    def run_program(self, source: str) -> str:
+        with tempfile.TemporaryDirectory() as tmp:
+            sfile = os.path.join(tmp, "source.xml")
+            with open(sfile, "w", encoding="utf-8") as fd:
+                fd.write(source)
+
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+                Interpret(sfile, sfile).interpret()
+
+        return out.getvalue()
+
+    def assert_exit_code(self, code: int, source: str) -> None:
+        with self.assertRaises(SystemExit) as context:
+            self.run_program(source)
+        self.assertEqual(context.exception.code, code)
+
+    def test_backward_jump(self):
+        output = self.run_program(program(
+            ("DEFVAR", ("var", "GF@i")),
+            ("MOVE", ("var", "GF@i"), ("int", "0")),
+            ("LABEL", ("label", "loop")),
+            ("WRITE", ("var", "GF@i")),
+            ("ADD", ("var", "GF@i"), ("var", "GF@i"), ("int", "1")),
+            ("JUMPIFNEQ", ("label", "loop"), ("var", "GF@i"), ("int", "3")),
+            ("JUMP", ("label", "end")),
+            ("WRITE", ("string", "skipped")),
+            ("LABEL", ("label", "end")),
+        ))
+        self.assertEqual(output, "012")
+
+    def test_call_return(self):
+        output = self.run_program(program(
+            ("CALL", ("label", "func")),
+            ("WRITE", ("string", "b")),
+            ("JUMP", ("label", "end")),
+            ("LABEL", ("label", "func")),
+            ("WRITE", ("string", "a")),
+            ("RETURN",),
+            ("LABEL", ("label", "end")),
+        ))
+        self.assertEqual(output, "ab")
+
+    def test_frames(self):
+        output = self.run_program(program(
+            ("CREATEFRAME",),
+            ("DEFVAR", ("var", "TF@x")),
+            ("MOVE", ("var", "TF@x"), ("string", "local")),
+            ("PUSHFRAME",),
+            ("WRITE", ("var", "LF@x")),
+            ("POPFRAME",),
+            ("WRITE", ("var", "TF@x")),
+        ))
+        self.assertEqual(output, "locallocal")
+
+    def test_string_escapes(self):
+        output = self.run_program(program(
+            ("WRITE", ("string", "a\\032b\\092\\035")),
+        ))
+        self.assertEqual(output, "a b\\#")
+
+    def test_unknown_opcode(self):
+        self.assert_exit_code(32, program(("NOSUCHOPCODE",)))
+
+    def test_undefined_label(self):
+        self.assert_exit_code(52, program(("JUMP", ("label", "nowhere"))))
+
+    def test_operand_types(self):
+        self.assert_exit_code(53, program(
+            ("DEFVAR", ("var", "GF@x")),
+            ("ADD", ("var", "GF@x"), ("int", "1"), ("string", "1")),
+        ))
+
+    def test_missing_value(self):
+        self.assert_exit_code(56, program(
+            ("DEFVAR", ("var", "GF@x")),
+            ("POPS", ("var", "GF@x")),
+        ))
+
+    def test_string_index(self):
+        self.assert_exit_code(58, program(
+            ("DEFVAR", ("var", "GF@x")),
+            ("GETCHAR", ("var", "GF@x"), ("string", "ab"), ("int", "5")),
+        ))
+
+if __name__ == "__main__":
+    unittest.main()